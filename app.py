@@ -6,7 +6,13 @@ Fixed projection math + Pitch Arsenal Matchups
 from flask import Flask, render_template, request, jsonify
 import sqlite3
 import csv
+import functools
+import itertools
 import os
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 app = Flask(__name__)
@@ -51,6 +57,18 @@ TEAM_MAP = {
     'Nationals': 'WSH', 'WSH': 'WSH', 'WSN': 'WSH', 'Washington Nationals': 'WSH',
 }
 
+class TeamLookup(dict):
+    """TEAM_MAP view whose misses (free agents, '2 Tms', blanks) resolve to 'FA'."""
+    def __missing__(self, key):
+        return 'FA'
+
+# Lowercased keys are new strings; intern them (and the ids) like the literals
+TEAM_IDS = TeamLookup({sys.intern(k.lower()): sys.intern(v) for k, v in TEAM_MAP.items()})
+
+def normalize_team(name):
+    """Team id for any TEAM_MAP spelling, ignoring case and padding ('d-backs', ' NYY')."""
+    return TEAM_IDS[(name or '').strip().lower()]
+
 PITCH_TYPE_MAP = {
     'FF': '4-Seam Fastball', 'SI': 'Sinker', 'FC': 'Cutter', 'SL': 'Slider',
     'ST': 'Sweeper', 'CU': 'Curveball', 'KC': 'Knuckle Curve', 'CH': 'Changeup',
@@ -67,36 +85,91 @@ LEAGUE_AVG = {
 # UTILITY FUNCTIONS
 # =============================================================================
 
-def get_db():
+def dict_row(cursor, row):
+    """Row factory building plain dicts directly, for single-table lookups
+    whose rows would otherwise be copied out of sqlite3.Row with dict()."""
+    return {col[0]: val for col, val in zip(cursor.description, row)}
+
+def get_db(row_factory=sqlite3.Row):
     conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn.row_factory = row_factory
+    # Per-connection tuning; journal_mode=WAL is persistent and set in init_db
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
     return conn
 
+_MISSING = frozenset((None, '', '-', 'NA', 'NULL', 'N/A'))
+
 def safe_float(val, default=None):
-    if val is None or val == '' or val == '-' or val == 'NA' or val == 'NULL' or val == 'N/A':
+    if val in _MISSING:
         return default
+    # Fast path: clean numeric strings (the vast majority of CSV cells)
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        pass
+    s = str(val)
+    if '%' in s or ',' in s:
+        s = s.replace('%', '').replace(',', '')
     try:
-        return float(str(val).replace('%', '').replace(',', '').strip())
+        return float(s.strip())
     except (ValueError, TypeError):
         return default
 
 def safe_int(val, default=0):
+    if val in _MISSING:
+        return default
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        pass
     try:
         return int(float(val))
     except (ValueError, TypeError):
         return default
 
+_PLAYER_ID_TRANS = str.maketrans({
+    ' ': '_', '.': '', "'": '', '-': '_', ',': '',
+    'í': 'i', 'é': 'e', 'á': 'a', 'ñ': 'n', 'ó': 'o', 'ú': 'u',
+})
+
+# Unbounded while an import runs; import_csvs clears both caches when done
+@functools.lru_cache(maxsize=None)
 def make_player_id(name):
     if not name:
         return None
-    return name.lower().replace(' ', '_').replace('.', '').replace("'", '').replace('-', '_').replace(',', '').replace('í', 'i').replace('é', 'e').replace('á', 'a').replace('ñ', 'n').replace('ó', 'o').replace('ú', 'u')
+    # Interned so spellings that normalise to the same id share one str
+    return sys.intern(name.lower().translate(_PLAYER_ID_TRANS))
+
+_FMT = {d: ('{:.' + str(d) + 'f}').format for d in range(7)}
+
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+def to_day(date_str):
+    """'YYYY-MM-DD' -> days since 1970-01-01 (None if unparseable)."""
+    try:
+        # strptime, not fromisoformat: 3.11 also takes compact '20240401'
+        return datetime.strptime(date_str, '%Y-%m-%d').toordinal() - EPOCH_ORDINAL
+    except (ValueError, TypeError):
+        return None
+
+@functools.lru_cache(maxsize=None)
+def flip_name(name):
+    """'Last, First' -> 'First Last'; names without a comma pass through."""
+    last, sep, first = name.partition(',')
+    return f"{first.strip()} {last.strip()}" if sep else name
 
 def format_stat(val, decimals=3, mult=1, default='-'):
-    if val is None:
+    if val is None or (isinstance(val, str) and not val.strip()):
         return default
+    fmt = _FMT.get(decimals) or ('{:.' + str(decimals) + 'f}').format
     try:
-        return f"{float(val) * mult:.{decimals}f}"
-    except:
+        if isinstance(val, float):
+            return fmt(val * mult)
+        return fmt(float(val) * mult)
+    except (ValueError, TypeError):
         return default
 
 # =============================================================================
@@ -106,6 +179,7 @@ def format_stat(val, decimals=3, mult=1, default='-'):
 def init_db():
     conn = get_db()
     cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode = WAL")
     
     cursor.execute("""CREATE TABLE IF NOT EXISTS teams (
         team_id TEXT PRIMARY KEY, name TEXT NOT NULL, abbreviation TEXT NOT NULL,
@@ -130,14 +204,16 @@ def init_db():
         wrc_plus REAL, drc_plus REAL, k_rate REAL, bb_rate REAL, iso REAL,
         babip REAL, barrel_rate REAL, hard_hit_rate REAL, avg_exit_velo REAL, war REAL)""")
     
+    # Per-player stat tables use a plain rowid key: ids are never referenced, so
+    # reuse after DELETE is fine and AUTOINCREMENT's sqlite_sequence write is skipped
     cursor.execute("""CREATE TABLE IF NOT EXISTS pitch_arsenal (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT, pitch_type TEXT,
+        id INTEGER PRIMARY KEY, player_id TEXT, pitch_type TEXT,
         pitch_name TEXT, usage_pct REAL, whiff_rate REAL, put_away_rate REAL,
         ba_against REAL, slg_against REAL, woba_against REAL, xwoba_against REAL,
         hard_hit_rate REAL)""")
     
     cursor.execute("""CREATE TABLE IF NOT EXISTS hitter_vs_pitch (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT, pitch_type TEXT,
+        id INTEGER PRIMARY KEY, player_id TEXT, pitch_type TEXT,
         pitch_name TEXT, pa INTEGER, whiff_rate REAL, ba REAL, slg REAL,
         woba REAL, xwoba REAL, run_value REAL)""")
     
@@ -146,7 +222,16 @@ def init_db():
         away_team TEXT, home_pitcher TEXT, away_pitcher TEXT,
         home_pitcher_id TEXT, away_pitcher_id TEXT, f5_home REAL, f5_away REAL,
         f5_total REAL, full_home REAL, full_away REAL, full_total REAL,
-        actual_home INTEGER, actual_away INTEGER, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+        actual_home INTEGER, actual_away INTEGER, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        game_date_i INTEGER)""")
+    # game_date_i = game_date as days since 1970-01-01, for integer range scans
+    cursor.execute("PRAGMA table_info(predictions)")
+    if 'game_date_i' not in [r['name'] for r in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE predictions ADD COLUMN game_date_i INTEGER")
+        # Backfilled through to_day so old rows parse exactly like new saves
+        cursor.execute("SELECT id, game_date FROM predictions")
+        cursor.executemany("UPDATE predictions SET game_date_i = ? WHERE id = ?",
+                           [(to_day(r['game_date']), r['id']) for r in cursor.fetchall()])
     
     # NEW v3.0 TABLES
     cursor.execute("""CREATE TABLE IF NOT EXISTS catcher_stats (
@@ -154,7 +239,7 @@ def init_db():
         blocks_above_avg REAL, pop_time_2b REAL, pop_time_3b REAL, max_arm_strength REAL)""")
     
     cursor.execute("""CREATE TABLE IF NOT EXISTS fielding_stats (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT, position TEXT,
+        id INTEGER PRIMARY KEY, player_id TEXT, position TEXT,
         outs_above_avg REAL, fielding_runs_prevented REAL, arm_strength REAL)""")
     
     cursor.execute("""CREATE TABLE IF NOT EXISTS baserunning_stats (
@@ -162,7 +247,7 @@ def init_db():
         bolts INTEGER, competitive_runs INTEGER)""")
     
     cursor.execute("""CREATE TABLE IF NOT EXISTS hitter_splits (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT, split_type TEXT,
+        id INTEGER PRIMARY KEY, player_id TEXT, split_type TEXT,
         pa INTEGER, bb_rate REAL, k_rate REAL, avg REAL, obp REAL, slg REAL,
         ops REAL, iso REAL, woba REAL, wrc_plus REAL)""")
     
@@ -182,7 +267,7 @@ def init_db():
         f_strike_pct REAL, swstr_pct REAL, csw_pct REAL)""")
     
     cursor.execute("""CREATE TABLE IF NOT EXISTS pitch_movement (
-        id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT, pitch_type TEXT,
+        id INTEGER PRIMARY KEY, player_id TEXT, pitch_type TEXT,
         pitch_name TEXT, avg_speed REAL, break_z REAL, break_z_induced REAL,
         break_x REAL, pitches_thrown INTEGER)""")
     
@@ -190,6 +275,19 @@ def init_db():
         id INTEGER PRIMARY KEY AUTOINCREMENT, weight_name TEXT UNIQUE,
         weight_value REAL, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
     
+    # Lookup indexes: the per-player tables without a player_id primary key
+    # Arsenals are always read in usage order, so the index carries it (replaces idx_arsenal_pid)
+    cursor.execute("DROP INDEX IF EXISTS idx_arsenal_pid")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_arsenal_usage ON pitch_arsenal (player_id, usage_pct DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_hvp_pid ON hitter_vs_pitch (player_id, pitch_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_movement_pid ON pitch_movement (player_id, pitch_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_splits_pid ON hitter_splits (player_id, split_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fielding_pid ON fielding_stats (player_id, position)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_team ON players (team_id, position)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_name ON players (name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_day ON predictions (game_date_i, home_team)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_created ON predictions (created_at)")
+    
     # CORRECTED weights - the key fix!
     # League avg wOBA (.315) should produce ~0.115 runs/PA
     # Formula: runs = (wOBA - 0.290) × 4.6
@@ -202,8 +300,7 @@ def init_db():
         ('woba_baseline', 0.290),           # FIXED: was 0.180
         ('arsenal_weight', 0.30),
     ]
-    for name, value in weights:
-        cursor.execute("INSERT OR REPLACE INTO model_weights (weight_name, weight_value) VALUES (?, ?)", (name, value))
+    cursor.executemany("INSERT OR REPLACE INTO model_weights (weight_name, weight_value) VALUES (?, ?)", weights)
     
     teams = [
         ('LAA', 'Los Angeles Angels', 'LAA', 'AL', 'West', 1.00),
@@ -237,8 +334,7 @@ def init_db():
         ('TOR', 'Toronto Blue Jays', 'TOR', 'AL', 'East', 1.01),
         ('WSH', 'Washington Nationals', 'WSH', 'NL', 'East', 1.00),
     ]
-    for team in teams:
-        cursor.execute("INSERT OR IGNORE INTO teams VALUES (?,?,?,?,?,?)", team)
+    cursor.executemany("INSERT OR IGNORE INTO teams VALUES (?,?,?,?,?,?)", teams)
     
     conn.commit()
     conn.close()
@@ -247,409 +343,438 @@ def init_db():
 # CSV IMPORT
 # =============================================================================
 
+def data_fingerprint(cursor):
+    """32-bit stamp of the CSV inputs (name, mtime, size) plus the DB schema.
+
+    Stored in PRAGMA user_version after an import so a restart can tell
+    whether the database already holds this exact data.
+    """
+    files = [(f, os.path.getmtime(f), os.path.getsize(f)) for f in CSV_SPECS if os.path.exists(f)]
+    cursor.execute("SELECT name, sql FROM sqlite_master ORDER BY name")
+    schema = [tuple(row) for row in cursor.fetchall()]
+    return zlib.crc32(repr((files, schema)).encode()) & 0x7fffffff
+
+# Column specs for the stat loaders: (CSV column or fallbacks, converter).
+# Order matches the VALUES list of the statement each spec feeds.
+FG_HITTER_COLUMNS = (
+    ('PA', safe_int), ('AB', safe_int), ('H', safe_int), ('HR', safe_int), ('R', safe_int),
+    ('RBI', safe_int), ('BB', safe_int), ('K', safe_int), ('AVG', safe_float), ('OBP', safe_float),
+    ('SLG', safe_float), ('OPS', safe_float), ('wOBA', safe_float), ('wRC+', safe_float),
+    ('K%', safe_float), ('BB%', safe_float), ('ISO', safe_float), ('BABIP', safe_float), ('WAR', safe_float),
+)
+SAVANT_HITTER_COLUMNS = (
+    ('xwoba', safe_float), ('barrel_batted_rate', safe_float),
+    ('hard_hit_percent', safe_float), ('avg_best_speed', safe_float),
+)
+BP_HITTER_COLUMNS = (('DRC+', safe_float),)
+FG_PITCHER_COLUMNS = (
+    ('G', safe_int), ('GS', safe_int), ('IP', safe_float), ('ERA', safe_float), ('xERA', safe_float),
+    ('FIP', safe_float), ('xFIP', safe_float), ('K/9', safe_float), ('BB/9', safe_float),
+    ('HR/9', safe_float), ('BABIP', safe_float), ('LOB%', safe_float), ('GB%', safe_float),
+    ('HR/FB', safe_float), ('vFA (pi)', safe_float), ('WAR', safe_float),
+)
+SAVANT_ARSENAL_COLUMNS = (
+    ('pitch_usage', safe_float), ('whiff_percent', safe_float), ('put_away', safe_float),
+    ('ba', safe_float), ('slg', safe_float), ('woba', safe_float), ('est_woba', safe_float),
+    ('hard_hit_percent', safe_float),
+)
+HITTER_VS_PITCH_COLUMNS = (
+    (('pa', 'pitches'), safe_int), (('whiff_percent', 'whiff_rate'), safe_float),
+    (('ba', 'batting_avg'), safe_float), (('slg', 'slugging'), safe_float), ('woba', safe_float),
+    (('est_woba', 'xwoba'), safe_float), (('run_value', 'rv'), safe_float),
+)
+SPLITS_COLUMNS = (
+    ('PA', safe_int), ('BB%', safe_float), ('K%', safe_float), ('AVG', safe_float), ('OBP', safe_float),
+    ('SLG', safe_float), ('OPS', safe_float), ('ISO', safe_float), ('wOBA', safe_float), ('wRC+', safe_float),
+)
+DISCIPLINE_COLUMNS = (
+    ('O-Swing%', safe_float), ('Z-Swing%', safe_float), ('Swing%', safe_float), ('O-Contact%', safe_float),
+    ('Z-Contact%', safe_float), ('Contact%', safe_float), ('Zone%', safe_float), ('F-Strike%', safe_float),
+    ('SwStr%', safe_float), ('CSW%', safe_float),
+)
+BATTED_BALL_COLUMNS = (
+    ('GB%', safe_float), ('FB%', safe_float), ('LD%', safe_float), ('HR/FB', safe_float), ('Pull%', safe_float),
+    ('Cent%', safe_float), ('Oppo%', safe_float), ('Soft%', safe_float), ('Med%', safe_float), ('Hard%', safe_float),
+)
+FG_NAME = (('Name', 'NameASCII'), str)
+
+# Every import input, in step order, with the columns its step reads
+CSV_SPECS = {
+    'fg_hitters.csv': (FG_NAME, ('Team', str)) + FG_HITTER_COLUMNS,
+    'savant_hitters.csv': (('first_name', str), ('last_name', str)) + SAVANT_HITTER_COLUMNS,
+    'bp_hitters.csv': (('Name', str),) + BP_HITTER_COLUMNS,
+    'fg_pitchers.csv': (FG_NAME, ('Team', str), ('MLBAMID', str)) + FG_PITCHER_COLUMNS,
+    'fg_pitch_mix.csv': None,  # only counted, see count_csv_rows
+    'savant_pitchers.csv': (('first_name', str), ('last_name', str), ('pitch_type', str), ('pitch_name', str)) + SAVANT_ARSENAL_COLUMNS,
+    'savant_hitters_pitch_arsenal.csv': (
+        (('first_name', 'name_first'), str), (('last_name', 'name_last'), str), (('player_name', 'name'), str),
+        ('pitch_type', str), ('pitch_name', str)) + HITTER_VS_PITCH_COLUMNS,
+    'catcher-framing.csv': (('name', str), ('rv_tot', safe_float)),
+    'catcher_blocking.csv': (('player_name', str), ('catcher_blocking_runs', safe_float), ('blocks_above_average', safe_float)),
+    'poptime.csv': (
+        ('entity_name', str), ('pop_2b_sba', safe_float), ('pop_3b_sba', safe_float), ('maxeff_arm_2b_3b_sba', safe_float)),
+    'outs_above_average.csv': (
+        ('last_name, first_name', str), ('primary_pos_formatted', str),
+        ('outs_above_average', safe_float), ('fielding_runs_prevented', safe_float)),
+    'arm_strength.csv': (('fielder_name', str), ('arm_overall', safe_float), ('max_arm_strength', safe_float)),
+    'sprint_speed.csv': (
+        ('last_name, first_name', str), ('sprint_speed', safe_float), ('hp_to_1b', safe_float),
+        ('bolts', safe_int), ('competitive_runs', safe_int)),
+    'Splits_Leaderboard_Data_vs_LHP.csv': (('Name', str),) + SPLITS_COLUMNS,
+    'Splits_Leaderboard_Data_vs_RHP.csv': (('Name', str),) + SPLITS_COLUMNS,
+    'fangraphs-leaderboards.csv': (FG_NAME,) + DISCIPLINE_COLUMNS,
+    'fangraphs-leaderboards-2.csv': (FG_NAME,) + BATTED_BALL_COLUMNS,
+    'fangraphs-leaderboards-4.csv': (FG_NAME,) + DISCIPLINE_COLUMNS,
+    'pitch_movement.csv': (
+        ('last_name, first_name', str), ('pitch_type', str), ('pitch_type_name', str), ('avg_speed', safe_float),
+        ('pitcher_break_z', safe_float), ('pitcher_break_z_induced', safe_float), ('pitcher_break_x', safe_float),
+        ('pitches_thrown', safe_int)),
+}
+
+def count_csv_rows(path):
+    """Data rows in a CSV, from a raw newline count (header excluded, final
+    newline optional). Assumes no quoted newlines or blank lines."""
+    lines, last = 0, b'\n'
+    with open(path, 'rb') as f:
+        for buf in iter(functools.partial(f.read, 1 << 20), b''):
+            lines += buf.count(b'\n')
+            last = buf[-1:]
+    return max(lines + (last != b'\n') - 1, 0)
+
+# Anything float()/int() accepts is converted identically by safe_float/safe_int
+_CLEAN_CONVERTERS = {safe_float: float, safe_int: int}
+
+def convert_column(values, conv):
+    """Convert a whole column: one map() with the bare builtin when every cell
+    is clean, otherwise the per-cell safe_* fallback."""
+    clean = _CLEAN_CONVERTERS.get(conv)
+    if clean is not None:
+        try:
+            return list(map(clean, values))
+        except ValueError:
+            pass
+    return list(map(conv, values))
+
+def read_csv(path, spec):
+    """Parse a CSV into (header, rows) keeping only the columns in `spec`.
+
+    Each row is a tuple of converted values in spec order; conversion runs a
+    column at a time. Fallback column names are resolved once against the
+    header; a column the file lacks reads as '' (what the old
+    row.get(col, '') defaults produced).
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        index = {col: i for i, col in enumerate(header)}  # last duplicate wins, as with DictReader
+        plan = []
+        for cols, conv in spec:
+            if isinstance(cols, str):
+                cols = (cols,)
+            # Missing columns read raw[-1], the '' appended to every row below;
+            # a row longer than the header can't reach it
+            plan.append((next((index[c] for c in cols if c in index), -1), conv))
+        pad = [''] * width
+        raws = []
+        for raw in reader:
+            if not raw: continue
+            if len(raw) < width:
+                raw += pad[len(raw):]
+            raw.append('')
+            raws.append(raw)
+    columns = [convert_column([raw[i] for raw in raws], conv) for i, conv in plan]
+    return header, list(zip(*columns))
+
+def bulk_load(cursor, sql, rows, flip_names=False):
+    """executemany `sql` over (player_id, *rest) for each (name, *rest) row.
+
+    Rows without a name are skipped; with flip_names, 'Last, First' names
+    become 'First Last'. Returns the number of rows written.
+    """
+    params = []
+    for row in rows:
+        name = row[0]
+        if not name: continue
+        if flip_names:
+            name = flip_name(name)
+        params.append((make_player_id(name),) + row[1:])
+    cursor.executemany(sql, params)
+    return len(params)
+
+def staged_upsert(cursor, table, columns, rows):
+    """INSERT OR REPLACE `rows` into `table` via an unindexed TEMP staging table.
+
+    The rows are bulk-copied into memory first and merged with one
+    INSERT ... SELECT, so the real table's keys are maintained in a single pass.
+    """
+    cols = ', '.join(columns)
+    cursor.execute(f"CREATE TEMP TABLE stg_{table} AS SELECT {cols} FROM {table} WHERE 0")
+    cursor.executemany(f"INSERT INTO stg_{table} VALUES ({', '.join('?' * len(columns))})", rows)
+    cursor.execute(f"INSERT OR REPLACE INTO {table} ({cols}) SELECT {cols} FROM stg_{table} ORDER BY rowid")
+    cursor.execute(f"DROP TABLE stg_{table}")
+
+# Secondary indexes nothing reads during the import; dropped up front and
+# rebuilt with one sort each before commit. idx_arsenal_usage and
+# idx_fielding_pid stay, since steps 6 and 12 look rows up through them.
+BULK_LOAD_INDEXES = ('idx_hvp_pid', 'idx_movement_pid', 'idx_splits_pid', 'idx_players_team', 'idx_players_name')
+
 def import_csvs():
     conn = get_db()
     cursor = conn.cursor()
-    print("=" * 60)
-    print("IMPORTING CSV DATA")
-    print("=" * 60)
-    
-    # 1. FanGraphs Hitters
-    if os.path.exists('fg_hitters.csv'):
-        print("\n[1/7] Loading fg_hitters.csv...")
-        with open('fg_hitters.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', row.get('NameASCII', ''))
-                if not name: continue
-                player_id = make_player_id(name)
-                team = TEAM_MAP.get(row.get('Team', ''), 'FA')
-                cursor.execute("INSERT OR REPLACE INTO players (player_id, name, team_id, position, bats) VALUES (?, ?, ?, 'OF', 'R')", (player_id, name, team))
-                cursor.execute("""INSERT OR REPLACE INTO hitter_stats 
-                    (player_id, pa, ab, hits, hr, runs, rbi, bb, k, avg, obp, slg, ops, woba, wrc_plus, k_rate, bb_rate, iso, babip, war)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (player_id, safe_int(row.get('PA')), safe_int(row.get('AB')), safe_int(row.get('H')),
-                     safe_int(row.get('HR')), safe_int(row.get('R')), safe_int(row.get('RBI')),
-                     safe_int(row.get('BB')), safe_int(row.get('K')), safe_float(row.get('AVG')),
-                     safe_float(row.get('OBP')), safe_float(row.get('SLG')), safe_float(row.get('OPS')),
-                     safe_float(row.get('wOBA')), safe_float(row.get('wRC+')), safe_float(row.get('K%')),
-                     safe_float(row.get('BB%')), safe_float(row.get('ISO')), safe_float(row.get('BABIP')),
-                     safe_float(row.get('WAR'))))
-                count += 1
-            print(f"      Loaded {count} hitters")
-    
-    # 2. Savant Hitters
-    if os.path.exists('savant_hitters.csv'):
-        print("\n[2/7] Loading savant_hitters.csv...")
-        with open('savant_hitters.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = f"{row.get('first_name', '')} {row.get('last_name', '')}".strip()
-                if not name or name == ' ': continue
-                player_id = make_player_id(name)
-                cursor.execute("""UPDATE hitter_stats SET xwoba=COALESCE(?,xwoba), barrel_rate=COALESCE(?,barrel_rate),
-                    hard_hit_rate=COALESCE(?,hard_hit_rate), avg_exit_velo=COALESCE(?,avg_exit_velo) WHERE player_id=?""",
-                    (safe_float(row.get('xwoba')), safe_float(row.get('barrel_batted_rate')),
-                     safe_float(row.get('hard_hit_percent')), safe_float(row.get('avg_best_speed')), player_id))
-                if cursor.rowcount > 0: count += 1
-            print(f"      Updated {count} hitters with Savant data")
-    
-    # 3. BP Hitters (DRC+)
-    if os.path.exists('bp_hitters.csv'):
-        print("\n[3/7] Loading bp_hitters.csv...")
-        with open('bp_hitters.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', '')
+    # One explicit write transaction for the whole import, committed at the end;
+    # IMMEDIATE takes the write lock up front instead of upgrading mid-import.
+    cursor.execute("PRAGMA cache_size = -200000")
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        # DDL is transactional too: a failed import rolls the drops back with it
+        rebuild = [sql for (sql,) in cursor.execute(
+            f"SELECT sql FROM sqlite_master WHERE type='index' AND name IN ({','.join('?' * len(BULK_LOAD_INDEXES))})",
+            BULK_LOAD_INDEXES)]
+        for name in BULK_LOAD_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        print("=" * 60)
+        print("IMPORTING CSV DATA")
+        print("=" * 60)
+        # One line per step once it finishes, with the time since the previous one
+        clock = [time.perf_counter()]
+        def report(step, message):
+            now = time.perf_counter()
+            print(f"[{step}] {message} ({now - clock[0]:.2f}s)")
+            clock[0] = now
+    
+        # Every input is parsed on worker threads, in step order, while earlier
+        # steps write; all writes stay on this connection.
+        pool = ThreadPoolExecutor(max_workers=4)
+        parsed = {path: pool.submit(read_csv, path, spec) for path, spec in CSV_SPECS.items()
+                  if spec is not None and os.path.exists(path)}
+        pool.shutdown(wait=False)
+    
+        # 1. FanGraphs Hitters
+        if 'fg_hitters.csv' in parsed:
+            _, rows = parsed['fg_hitters.csv'].result()
+            players, stats = [], []
+            for row in rows:
+                name = row[0]
                 if not name: continue
                 player_id = make_player_id(name)
-                cursor.execute("UPDATE hitter_stats SET drc_plus=? WHERE player_id=?", (safe_float(row.get('DRC+')), player_id))
-                if cursor.rowcount > 0: count += 1
-            print(f"      Updated {count} hitters with DRC+")
-    
-    # 4. FanGraphs Pitchers
-    if os.path.exists('fg_pitchers.csv'):
-        print("\n[4/7] Loading fg_pitchers.csv...")
-        with open('fg_pitchers.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', row.get('NameASCII', ''))
+                players.append((player_id, name, normalize_team(row[1])))
+                stats.append((player_id,) + row[2:])
+            cursor.executemany("INSERT OR REPLACE INTO players (player_id, name, team_id, position, bats) VALUES (?, ?, ?, 'OF', 'R')", players)
+            staged_upsert(cursor, 'hitter_stats', ('player_id', 'pa', 'ab', 'hits', 'hr', 'runs', 'rbi', 'bb', 'k', 'avg', 'obp', 'slg',
+                'ops', 'woba', 'wrc_plus', 'k_rate', 'bb_rate', 'iso', 'babip', 'war'), stats)
+            count = len(stats)
+            report('1/7', f"fg_hitters.csv: loaded {count} hitters")
+    
+        # 2. Savant Hitters
+        if 'savant_hitters.csv' in parsed:
+            _, rows = parsed['savant_hitters.csv'].result()
+            bulk_load(cursor, """UPDATE hitter_stats SET xwoba=COALESCE(?2,xwoba), barrel_rate=COALESCE(?3,barrel_rate),
+                hard_hit_rate=COALESCE(?4,hard_hit_rate), avg_exit_velo=COALESCE(?5,avg_exit_velo) WHERE player_id=?1""",
+                [(f"{row[0]} {row[1]}".strip(),) + row[2:] for row in rows])
+            count = cursor.rowcount
+            report('2/7', f"savant_hitters.csv: updated {count} hitters with Savant data")
+    
+        # 3. BP Hitters (DRC+)
+        if 'bp_hitters.csv' in parsed:
+            _, rows = parsed['bp_hitters.csv'].result()
+            bulk_load(cursor, "UPDATE hitter_stats SET drc_plus=?2 WHERE player_id=?1", rows)
+            count = cursor.rowcount
+            report('3/7', f"bp_hitters.csv: updated {count} hitters with DRC+")
+    
+        # 4. FanGraphs Pitchers
+        if 'fg_pitchers.csv' in parsed:
+            _, rows = parsed['fg_pitchers.csv'].result()
+            players, stats = [], []
+            for row in rows:
+                name = row[0]
                 if not name: continue
                 player_id = make_player_id(name)
-                team = TEAM_MAP.get(row.get('Team', ''), 'FA')
-                mlbam = row.get('MLBAMID', '')
-                cursor.execute("INSERT OR REPLACE INTO players (player_id, name, team_id, position, throws, mlbam_id) VALUES (?, ?, ?, 'P', 'R', ?)",
-                    (player_id, name, team, mlbam))
-                ip = safe_float(row.get('IP'), 0)
-                gs = safe_int(row.get('GS'), 0)
+                players.append((player_id, name, normalize_team(row[1]), row[2]))
+                values = row[3:]
+                gs, ip = values[1], values[2] or 0
                 avg_ip = (ip / gs) if gs > 0 else 5.0
-                cursor.execute("""INSERT OR REPLACE INTO pitcher_stats 
-                    (player_id, games, games_started, innings_pitched, era, xera, fip, xfip, k9, bb9, hr9, babip, lob_pct, gb_pct, hr_fb, fb_velo, war, avg_innings_per_start)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (player_id, safe_int(row.get('G')), safe_int(row.get('GS')), safe_float(row.get('IP')),
-                     safe_float(row.get('ERA')), safe_float(row.get('xERA')), safe_float(row.get('FIP')),
-                     safe_float(row.get('xFIP')), safe_float(row.get('K/9')), safe_float(row.get('BB/9')),
-                     safe_float(row.get('HR/9')), safe_float(row.get('BABIP')), safe_float(row.get('LOB%')),
-                     safe_float(row.get('GB%')), safe_float(row.get('HR/FB')), safe_float(row.get('vFA (pi)')),
-                     safe_float(row.get('WAR')), avg_ip))
-                count += 1
-            print(f"      Loaded {count} pitchers")
-    
-    # 5. Pitch Mix
-    if os.path.exists('fg_pitch_mix.csv'):
-        print("\n[5/7] Loading fg_pitch_mix.csv...")
-        with open('fg_pitch_mix.csv', 'r', encoding='utf-8-sig') as f:
-            count = sum(1 for _ in csv.DictReader(f))
-            print(f"      Processed {count} rows")
-    
-    # 6. Savant Pitchers (pitch arsenal)
-    if os.path.exists('savant_pitchers.csv'):
-        print("\n[6/7] Loading savant_pitchers.csv...")
-        cursor.execute("DELETE FROM pitch_arsenal")
-        with open('savant_pitchers.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            player_data = {}
-            for row in reader:
-                name = f"{row.get('first_name', '')} {row.get('last_name', '')}".strip()
+                stats.append((player_id,) + values + (avg_ip,))
+            cursor.executemany("INSERT OR REPLACE INTO players (player_id, name, team_id, position, throws, mlbam_id) VALUES (?, ?, ?, 'P', 'R', ?)", players)
+            staged_upsert(cursor, 'pitcher_stats', ('player_id', 'games', 'games_started', 'innings_pitched', 'era', 'xera', 'fip', 'xfip',
+                'k9', 'bb9', 'hr9', 'babip', 'lob_pct', 'gb_pct', 'hr_fb', 'fb_velo', 'war', 'avg_innings_per_start'), stats)
+            count = len(stats)
+            report('4/7', f"fg_pitchers.csv: loaded {count} pitchers")
+    
+        # 5. Pitch Mix
+        if os.path.exists('fg_pitch_mix.csv'):
+            count = count_csv_rows('fg_pitch_mix.csv')
+            report('5/7', f"fg_pitch_mix.csv: processed {count} rows")
+    
+        # 6. Savant Pitchers (pitch arsenal)
+        if 'savant_pitchers.csv' in parsed:
+            cursor.execute("DELETE FROM pitch_arsenal")
+            header, rows = parsed['savant_pitchers.csv'].result()
+            has_pitch_name = 'pitch_name' in header
+            arsenal = []
+            for row in rows:
+                name = f"{row[0]} {row[1]}".strip()
                 if not name or name == ' ': continue
                 player_id = make_player_id(name)
-                pitch_type = row.get('pitch_type', '')
-                cursor.execute("""INSERT INTO pitch_arsenal (player_id, pitch_type, pitch_name, usage_pct, whiff_rate, put_away_rate, ba_against, slg_against, woba_against, xwoba_against, hard_hit_rate)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (player_id, pitch_type, row.get('pitch_name', PITCH_TYPE_MAP.get(pitch_type, pitch_type)),
-                     safe_float(row.get('pitch_usage')), safe_float(row.get('whiff_percent')),
-                     safe_float(row.get('put_away')), safe_float(row.get('ba')), safe_float(row.get('slg')),
-                     safe_float(row.get('woba')), safe_float(row.get('est_woba')), safe_float(row.get('hard_hit_percent'))))
-                usage = safe_float(row.get('pitch_usage'), 0)
-                xwoba = safe_float(row.get('est_woba'))
-                if player_id not in player_data:
-                    player_data[player_id] = {'usage': 0, 'xwoba': 0, 'whiff': 0, 'hh': 0}
-                if usage and xwoba:
-                    player_data[player_id]['usage'] += usage
-                    player_data[player_id]['xwoba'] += usage * xwoba
-                count += 1
-            for pid, data in player_data.items():
-                if data['usage'] > 0:
-                    cursor.execute("UPDATE pitcher_stats SET xwoba_against=? WHERE player_id=?",
-                        (data['xwoba'] / data['usage'], pid))
-            print(f"      Loaded {count} pitch arsenal rows")
-    
-    # 7. Hitter vs Pitch Type (NEW!)
-    if os.path.exists('savant_hitters_pitch_arsenal.csv'):
-        print("\n[7/7] Loading savant_hitters_pitch_arsenal.csv...")
-        cursor.execute("DELETE FROM hitter_vs_pitch")
-        with open('savant_hitters_pitch_arsenal.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                first = row.get('first_name', row.get('name_first', ''))
-                last = row.get('last_name', row.get('name_last', ''))
+                pitch_type = row[2]
+                pitch_name = row[3] if has_pitch_name else PITCH_TYPE_MAP.get(pitch_type, pitch_type)
+                values = row[4:]
+                arsenal.append((player_id, pitch_type, pitch_name) + values)
+            cursor.executemany("""INSERT INTO pitch_arsenal (player_id, pitch_type, pitch_name, usage_pct, whiff_rate, put_away_rate, ba_against, slg_against, woba_against, xwoba_against, hard_hit_rate)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", arsenal)
+            # Usage-weighted xwOBA against, over pitches with both values set (non-zero)
+            cursor.execute("""UPDATE pitcher_stats SET xwoba_against = (
+                    SELECT SUM(usage_pct * xwoba_against) / SUM(usage_pct) FROM pitch_arsenal a
+                    WHERE a.player_id = pitcher_stats.player_id AND usage_pct != 0 AND xwoba_against != 0)
+                WHERE player_id IN (SELECT player_id FROM pitch_arsenal WHERE usage_pct != 0 AND xwoba_against != 0
+                    GROUP BY player_id HAVING SUM(usage_pct) > 0)""")
+            count = len(arsenal)
+            report('6/7', f"savant_pitchers.csv: loaded {count} pitch arsenal rows")
+    
+        # 7. Hitter vs Pitch Type (NEW!)
+        if 'savant_hitters_pitch_arsenal.csv' in parsed:
+            cursor.execute("DELETE FROM hitter_vs_pitch")
+            header, rows = parsed['savant_hitters_pitch_arsenal.csv'].result()
+            has_pitch_name = 'pitch_name' in header
+            vs_pitch = []
+            for row in rows:
+                first, last, full = row[0], row[1], row[2]
                 if not first and not last:
-                    full = row.get('player_name', row.get('name', ''))
                     if full:
                         parts = full.split(' ', 1)
                         first, last = (parts[0], parts[1]) if len(parts) > 1 else (parts[0], '')
                 name = f"{first} {last}".strip()
                 if not name or name == ' ': continue
                 player_id = make_player_id(name)
-                pitch_type = row.get('pitch_type', '')
-                cursor.execute("""INSERT INTO hitter_vs_pitch (player_id, pitch_type, pitch_name, pa, whiff_rate, ba, slg, woba, xwoba, run_value)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (player_id, pitch_type, row.get('pitch_name', PITCH_TYPE_MAP.get(pitch_type, pitch_type)),
-                     safe_int(row.get('pa', row.get('pitches', 0))), safe_float(row.get('whiff_percent', row.get('whiff_rate'))),
-                     safe_float(row.get('ba', row.get('batting_avg'))), safe_float(row.get('slg', row.get('slugging'))),
-                     safe_float(row.get('woba')), safe_float(row.get('est_woba', row.get('xwoba'))),
-                     safe_float(row.get('run_value', row.get('rv')))))
-                count += 1
-            print(f"      Loaded {count} hitter vs pitch rows")
-    else:
-        print("\n[7/7] savant_hitters_pitch_arsenal.csv not found")
-    
-    # 8. Catcher Framing
-    if os.path.exists('catcher-framing.csv'):
-        print("\n[8] Loading catcher-framing.csv...")
-        with open('catcher-framing.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('name', '')
-                if not name: continue
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO catcher_stats (player_id, framing_runs) VALUES (?, ?)",
-                    (player_id, safe_float(row.get('rv_tot'))))
-                count += 1
-            print(f"      Loaded {count} catcher framing rows")
-    
-    # 9. Catcher Blocking
-    if os.path.exists('catcher_blocking.csv'):
-        print("\n[9] Loading catcher_blocking.csv...")
-        with open('catcher_blocking.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('player_name', '')
-                if not name: continue
-                if ',' in name:
-                    parts = name.split(',', 1)
-                    name = f"{parts[1].strip()} {parts[0].strip()}"
-                player_id = make_player_id(name)
-                cursor.execute("UPDATE catcher_stats SET blocking_runs=?, blocks_above_avg=? WHERE player_id=?",
-                    (safe_float(row.get('catcher_blocking_runs')), safe_float(row.get('blocks_above_average')), player_id))
-                if cursor.rowcount == 0:
-                    cursor.execute("INSERT INTO catcher_stats (player_id, blocking_runs, blocks_above_avg) VALUES (?, ?, ?)",
-                        (player_id, safe_float(row.get('catcher_blocking_runs')), safe_float(row.get('blocks_above_average'))))
-                count += 1
-            print(f"      Loaded {count} catcher blocking rows")
-    
-    # 10. Catcher Poptime
-    if os.path.exists('poptime.csv'):
-        print("\n[10] Loading poptime.csv...")
-        with open('poptime.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('entity_name', '')
-                if not name: continue
-                if ',' in name:
-                    parts = name.split(',', 1)
-                    name = f"{parts[1].strip()} {parts[0].strip()}"
-                player_id = make_player_id(name)
-                cursor.execute("UPDATE catcher_stats SET pop_time_2b=?, pop_time_3b=?, max_arm_strength=? WHERE player_id=?",
-                    (safe_float(row.get('pop_2b_sba')), safe_float(row.get('pop_3b_sba')), safe_float(row.get('maxeff_arm_2b_3b_sba')), player_id))
-                if cursor.rowcount == 0:
-                    cursor.execute("INSERT INTO catcher_stats (player_id, pop_time_2b, pop_time_3b, max_arm_strength) VALUES (?, ?, ?, ?)",
-                        (player_id, safe_float(row.get('pop_2b_sba')), safe_float(row.get('pop_3b_sba')), safe_float(row.get('maxeff_arm_2b_3b_sba'))))
-                count += 1
-            print(f"      Loaded {count} catcher poptime rows")
-    
-    # 11. Fielding OAA
-    if os.path.exists('outs_above_average.csv'):
-        print("\n[11] Loading outs_above_average.csv...")
-        cursor.execute("DELETE FROM fielding_stats")
-        with open('outs_above_average.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('last_name, first_name', '')
-                if not name: continue
-                if ',' in name:
-                    parts = name.split(',', 1)
-                    name = f"{parts[1].strip()} {parts[0].strip()}"
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO fielding_stats (player_id, position, outs_above_avg, fielding_runs_prevented) VALUES (?, ?, ?, ?)",
-                    (player_id, row.get('primary_pos_formatted', ''), safe_float(row.get('outs_above_average')), safe_float(row.get('fielding_runs_prevented'))))
-                count += 1
-            print(f"      Loaded {count} fielding OAA rows")
-    
-    # 12. Arm Strength
-    if os.path.exists('arm_strength.csv'):
-        print("\n[12] Loading arm_strength.csv...")
-        with open('arm_strength.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('fielder_name', '')
-                if not name: continue
-                if ',' in name:
-                    parts = name.split(',', 1)
-                    name = f"{parts[1].strip()} {parts[0].strip()}"
-                player_id = make_player_id(name)
-                arm = safe_float(row.get('arm_overall')) or safe_float(row.get('max_arm_strength'))
-                cursor.execute("UPDATE fielding_stats SET arm_strength=? WHERE player_id=?", (arm, player_id))
-                count += 1
-            print(f"      Updated {count} arm strength rows")
-    
-    # 13. Sprint Speed
-    if os.path.exists('sprint_speed.csv'):
-        print("\n[13] Loading sprint_speed.csv...")
-        cursor.execute("DELETE FROM baserunning_stats")
-        with open('sprint_speed.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('last_name, first_name', '')
-                if not name: continue
-                if ',' in name:
-                    parts = name.split(',', 1)
-                    name = f"{parts[1].strip()} {parts[0].strip()}"
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO baserunning_stats (player_id, sprint_speed, hp_to_1b, bolts, competitive_runs) VALUES (?, ?, ?, ?, ?)",
-                    (player_id, safe_float(row.get('sprint_speed')), safe_float(row.get('hp_to_1b')), safe_int(row.get('bolts')), safe_int(row.get('competitive_runs'))))
-                count += 1
-            print(f"      Loaded {count} sprint speed rows")
-    
-    # 14. Hitter Splits vs LHP
-    if os.path.exists('Splits_Leaderboard_Data_vs_LHP.csv'):
-        print("\n[14] Loading Splits vs LHP...")
-        cursor.execute("DELETE FROM hitter_splits WHERE split_type='vs_LHP'")
-        with open('Splits_Leaderboard_Data_vs_LHP.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', '')
-                if not name: continue
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO hitter_splits (player_id, split_type, pa, bb_rate, k_rate, avg, obp, slg, ops, iso, woba, wrc_plus) VALUES (?, 'vs_LHP', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (player_id, safe_int(row.get('PA')), safe_float(row.get('BB%')), safe_float(row.get('K%')), safe_float(row.get('AVG')), safe_float(row.get('OBP')), safe_float(row.get('SLG')), safe_float(row.get('OPS')), safe_float(row.get('ISO')), safe_float(row.get('wOBA')), safe_float(row.get('wRC+'))))
-                count += 1
-            print(f"      Loaded {count} hitter vs LHP rows")
-    
-    # 15. Hitter Splits vs RHP
-    if os.path.exists('Splits_Leaderboard_Data_vs_RHP.csv'):
-        print("\n[15] Loading Splits vs RHP...")
-        cursor.execute("DELETE FROM hitter_splits WHERE split_type='vs_RHP'")
-        with open('Splits_Leaderboard_Data_vs_RHP.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', '')
-                if not name: continue
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO hitter_splits (player_id, split_type, pa, bb_rate, k_rate, avg, obp, slg, ops, iso, woba, wrc_plus) VALUES (?, 'vs_RHP', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (player_id, safe_int(row.get('PA')), safe_float(row.get('BB%')), safe_float(row.get('K%')), safe_float(row.get('AVG')), safe_float(row.get('OBP')), safe_float(row.get('SLG')), safe_float(row.get('OPS')), safe_float(row.get('ISO')), safe_float(row.get('wOBA')), safe_float(row.get('wRC+'))))
-                count += 1
-            print(f"      Loaded {count} hitter vs RHP rows")
-    
-    # 16. Hitter Discipline
-    if os.path.exists('fangraphs-leaderboards.csv'):
-        print("\n[16] Loading hitter discipline...")
-        cursor.execute("DELETE FROM hitter_discipline")
-        with open('fangraphs-leaderboards.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', row.get('NameASCII', ''))
-                if not name: continue
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO hitter_discipline (player_id, o_swing_pct, z_swing_pct, swing_pct, o_contact_pct, z_contact_pct, contact_pct, zone_pct, f_strike_pct, swstr_pct, csw_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (player_id, safe_float(row.get('O-Swing%')), safe_float(row.get('Z-Swing%')), safe_float(row.get('Swing%')), safe_float(row.get('O-Contact%')), safe_float(row.get('Z-Contact%')), safe_float(row.get('Contact%')), safe_float(row.get('Zone%')), safe_float(row.get('F-Strike%')), safe_float(row.get('SwStr%')), safe_float(row.get('CSW%'))))
-                count += 1
-            print(f"      Loaded {count} hitter discipline rows")
-    
-    # 17. Hitter Batted Ball
-    if os.path.exists('fangraphs-leaderboards-2.csv'):
-        print("\n[17] Loading hitter batted ball...")
-        cursor.execute("DELETE FROM hitter_batted_ball")
-        with open('fangraphs-leaderboards-2.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', row.get('NameASCII', ''))
-                if not name: continue
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO hitter_batted_ball (player_id, gb_pct, fb_pct, ld_pct, hr_fb, pull_pct, cent_pct, oppo_pct, soft_pct, med_pct, hard_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (player_id, safe_float(row.get('GB%')), safe_float(row.get('FB%')), safe_float(row.get('LD%')), safe_float(row.get('HR/FB')), safe_float(row.get('Pull%')), safe_float(row.get('Cent%')), safe_float(row.get('Oppo%')), safe_float(row.get('Soft%')), safe_float(row.get('Med%')), safe_float(row.get('Hard%'))))
-                count += 1
-            print(f"      Loaded {count} hitter batted ball rows")
-    
-    # 18. Pitcher Discipline
-    if os.path.exists('fangraphs-leaderboards-4.csv'):
-        print("\n[18] Loading pitcher discipline...")
-        cursor.execute("DELETE FROM pitcher_discipline")
-        with open('fangraphs-leaderboards-4.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('Name', row.get('NameASCII', ''))
-                if not name: continue
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO pitcher_discipline (player_id, o_swing_pct, z_swing_pct, swing_pct, o_contact_pct, z_contact_pct, contact_pct, zone_pct, f_strike_pct, swstr_pct, csw_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (player_id, safe_float(row.get('O-Swing%')), safe_float(row.get('Z-Swing%')), safe_float(row.get('Swing%')), safe_float(row.get('O-Contact%')), safe_float(row.get('Z-Contact%')), safe_float(row.get('Contact%')), safe_float(row.get('Zone%')), safe_float(row.get('F-Strike%')), safe_float(row.get('SwStr%')), safe_float(row.get('CSW%'))))
-                count += 1
-            print(f"      Loaded {count} pitcher discipline rows")
-    
-    # 19. Pitch Movement
-    if os.path.exists('pitch_movement.csv'):
-        print("\n[19] Loading pitch movement...")
-        cursor.execute("DELETE FROM pitch_movement")
-        with open('pitch_movement.csv', 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
-                name = row.get('last_name, first_name', '')
-                if not name: continue
-                if ',' in name:
-                    parts = name.split(',', 1)
-                    name = f"{parts[1].strip()} {parts[0].strip()}"
-                player_id = make_player_id(name)
-                cursor.execute("INSERT OR REPLACE INTO pitch_movement (player_id, pitch_type, pitch_name, avg_speed, break_z, break_z_induced, break_x, pitches_thrown) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (player_id, row.get('pitch_type', ''), row.get('pitch_type_name', ''), safe_float(row.get('avg_speed')), safe_float(row.get('pitcher_break_z')), safe_float(row.get('pitcher_break_z_induced')), safe_float(row.get('pitcher_break_x')), safe_int(row.get('pitches_thrown'))))
-                count += 1
-            print(f"      Loaded {count} pitch movement rows")
-    
-    conn.commit()
-    
-    # Print summary
-    print("\n" + "=" * 60)
-    print("IMPORT SUMMARY")
-    print("=" * 60)
-    cursor.execute("SELECT COUNT(*) as c FROM players WHERE position='P'")
-    p_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM players WHERE position!='P'")
-    h_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM pitch_arsenal")
-    a_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM hitter_vs_pitch")
-    hvp_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM catcher_stats")
-    c_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM fielding_stats")
-    f_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM baserunning_stats")
-    b_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM hitter_splits")
-    s_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM hitter_discipline")
-    hd_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM pitcher_discipline")
-    pd_count = cursor.fetchone()['c']
-    cursor.execute("SELECT COUNT(*) as c FROM pitch_movement")
-    pm_count = cursor.fetchone()['c']
+                pitch_type = row[3]
+                pitch_name = row[4] if has_pitch_name else PITCH_TYPE_MAP.get(pitch_type, pitch_type)
+                vs_pitch.append((player_id, pitch_type, pitch_name) + row[5:])
+            cursor.executemany("""INSERT INTO hitter_vs_pitch (player_id, pitch_type, pitch_name, pa, whiff_rate, ba, slg, woba, xwoba, run_value)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", vs_pitch)
+            count = len(vs_pitch)
+            report('7/7', f"savant_hitters_pitch_arsenal.csv: loaded {count} hitter vs pitch rows")
+        else:
+            report('7/7', "savant_hitters_pitch_arsenal.csv: not found")
+    
+        # 8. Catcher Framing
+        if 'catcher-framing.csv' in parsed:
+            _, rows = parsed['catcher-framing.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO catcher_stats (player_id, framing_runs) VALUES (?, ?)", rows)
+            report('8', f"catcher-framing.csv: loaded {count} catcher framing rows")
+    
+        # 9. Catcher Blocking
+        if 'catcher_blocking.csv' in parsed:
+            _, rows = parsed['catcher_blocking.csv'].result()
+            count = bulk_load(cursor, """INSERT INTO catcher_stats (player_id, blocking_runs, blocks_above_avg) VALUES (?, ?, ?)
+                ON CONFLICT(player_id) DO UPDATE SET blocking_runs=excluded.blocking_runs, blocks_above_avg=excluded.blocks_above_avg""",
+                rows, flip_names=True)
+            report('9', f"catcher_blocking.csv: loaded {count} catcher blocking rows")
+    
+        # 10. Catcher Poptime
+        if 'poptime.csv' in parsed:
+            _, rows = parsed['poptime.csv'].result()
+            count = bulk_load(cursor, """INSERT INTO catcher_stats (player_id, pop_time_2b, pop_time_3b, max_arm_strength) VALUES (?, ?, ?, ?)
+                ON CONFLICT(player_id) DO UPDATE SET pop_time_2b=excluded.pop_time_2b, pop_time_3b=excluded.pop_time_3b,
+                max_arm_strength=excluded.max_arm_strength""",
+                rows, flip_names=True)
+            report('10', f"poptime.csv: loaded {count} catcher poptime rows")
+    
+        # 11. Fielding OAA
+        if 'outs_above_average.csv' in parsed:
+            cursor.execute("DELETE FROM fielding_stats")
+            _, rows = parsed['outs_above_average.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO fielding_stats (player_id, position, outs_above_avg, fielding_runs_prevented) VALUES (?, ?, ?, ?)",
+                rows, flip_names=True)
+            report('11', f"outs_above_average.csv: loaded {count} fielding OAA rows")
+    
+        # 12. Arm Strength
+        if 'arm_strength.csv' in parsed:
+            _, rows = parsed['arm_strength.csv'].result()
+            count = bulk_load(cursor, "UPDATE fielding_stats SET arm_strength=?2 WHERE player_id=?1",
+                [(name, arm_overall or max_arm) for name, arm_overall, max_arm in rows], flip_names=True)
+            report('12', f"arm_strength.csv: updated {count} arm strength rows")
+    
+        # 13. Sprint Speed
+        if 'sprint_speed.csv' in parsed:
+            cursor.execute("DELETE FROM baserunning_stats")
+            _, rows = parsed['sprint_speed.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO baserunning_stats (player_id, sprint_speed, hp_to_1b, bolts, competitive_runs) VALUES (?, ?, ?, ?, ?)",
+                rows, flip_names=True)
+            report('13', f"sprint_speed.csv: loaded {count} sprint speed rows")
+    
+        # 14. Hitter Splits vs LHP
+        if 'Splits_Leaderboard_Data_vs_LHP.csv' in parsed:
+            cursor.execute("DELETE FROM hitter_splits WHERE split_type='vs_LHP'")
+            _, rows = parsed['Splits_Leaderboard_Data_vs_LHP.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO hitter_splits (player_id, split_type, pa, bb_rate, k_rate, avg, obp, slg, ops, iso, woba, wrc_plus) VALUES (?, 'vs_LHP', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            report('14', f"Splits vs LHP: loaded {count} hitter vs LHP rows")
+    
+        # 15. Hitter Splits vs RHP
+        if 'Splits_Leaderboard_Data_vs_RHP.csv' in parsed:
+            cursor.execute("DELETE FROM hitter_splits WHERE split_type='vs_RHP'")
+            _, rows = parsed['Splits_Leaderboard_Data_vs_RHP.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO hitter_splits (player_id, split_type, pa, bb_rate, k_rate, avg, obp, slg, ops, iso, woba, wrc_plus) VALUES (?, 'vs_RHP', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            report('15', f"Splits vs RHP: loaded {count} hitter vs RHP rows")
+    
+        # 16. Hitter Discipline
+        if 'fangraphs-leaderboards.csv' in parsed:
+            cursor.execute("DELETE FROM hitter_discipline")
+            _, rows = parsed['fangraphs-leaderboards.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO hitter_discipline (player_id, o_swing_pct, z_swing_pct, swing_pct, o_contact_pct, z_contact_pct, contact_pct, zone_pct, f_strike_pct, swstr_pct, csw_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            report('16', f"hitter discipline: loaded {count} hitter discipline rows")
+    
+        # 17. Hitter Batted Ball
+        if 'fangraphs-leaderboards-2.csv' in parsed:
+            cursor.execute("DELETE FROM hitter_batted_ball")
+            _, rows = parsed['fangraphs-leaderboards-2.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO hitter_batted_ball (player_id, gb_pct, fb_pct, ld_pct, hr_fb, pull_pct, cent_pct, oppo_pct, soft_pct, med_pct, hard_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            report('17', f"hitter batted ball: loaded {count} hitter batted ball rows")
+    
+        # 18. Pitcher Discipline
+        if 'fangraphs-leaderboards-4.csv' in parsed:
+            cursor.execute("DELETE FROM pitcher_discipline")
+            _, rows = parsed['fangraphs-leaderboards-4.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO pitcher_discipline (player_id, o_swing_pct, z_swing_pct, swing_pct, o_contact_pct, z_contact_pct, contact_pct, zone_pct, f_strike_pct, swstr_pct, csw_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            report('18', f"pitcher discipline: loaded {count} pitcher discipline rows")
+    
+        # 19. Pitch Movement
+        if 'pitch_movement.csv' in parsed:
+            cursor.execute("DELETE FROM pitch_movement")
+            _, rows = parsed['pitch_movement.csv'].result()
+            count = bulk_load(cursor, "INSERT OR REPLACE INTO pitch_movement (player_id, pitch_type, pitch_name, avg_speed, break_z, break_z_induced, break_x, pitches_thrown) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows, flip_names=True)
+            report('19', f"pitch movement: loaded {count} pitch movement rows")
+    
+        for sql in rebuild:
+            cursor.execute(sql)
+        cursor.execute(f"PRAGMA user_version = {data_fingerprint(cursor)}")
+        conn.commit()
+        invalidate_caches()
+        make_player_id.cache_clear()
+        flip_name.cache_clear()
+    
+        # Print summary
+        print("\n" + "=" * 60)
+        print("IMPORT SUMMARY")
+        print("=" * 60)
+        cursor.execute("""SELECT COUNT(CASE WHEN position = 'P' THEN 1 END), COUNT(CASE WHEN position != 'P' THEN 1 END),
+            (SELECT COUNT(*) FROM pitch_arsenal), (SELECT COUNT(*) FROM hitter_vs_pitch), (SELECT COUNT(*) FROM catcher_stats),
+            (SELECT COUNT(*) FROM fielding_stats), (SELECT COUNT(*) FROM baserunning_stats), (SELECT COUNT(*) FROM hitter_splits),
+            (SELECT COUNT(*) FROM hitter_discipline), (SELECT COUNT(*) FROM pitcher_discipline), (SELECT COUNT(*) FROM pitch_movement)
+            FROM players""")
+        (p_count, h_count, a_count, hvp_count, c_count, f_count, b_count, s_count,
+         hd_count, pd_count, pm_count) = cursor.fetchone()
+    except BaseException:
+        # Releases the write lock now and brings the dropped indexes back
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
     
     print(f"  Pitchers: {p_count}")
     print(f"  Hitters: {h_count}")
@@ -663,7 +788,6 @@ def import_csvs():
     print(f"  Pitcher Discipline: {pd_count}")
     print(f"  Pitch Movement: {pm_count}")
     
-    conn.close()
     return {'pitchers': p_count, 'hitters': h_count, 'arsenal': a_count, 'hitter_vs_pitch': hvp_count, 
             'catchers': c_count, 'fielding': f_count, 'baserunning': b_count, 'splits': s_count,
             'hitter_discipline': hd_count, 'pitcher_discipline': pd_count, 'pitch_movement': pm_count}
@@ -730,77 +854,37 @@ def import_csvs():
 #
 # =============================================================================
 
+@functools.lru_cache(maxsize=1)
 def get_model_weights():
+    # Cached until invalidate_caches(); callers only read the returned dict
     conn = get_db()
     cursor = conn.cursor()
     cursor.execute("SELECT weight_name, weight_value FROM model_weights")
-    weights = {row['weight_name']: row['weight_value'] for row in cursor.fetchall()}
+    weights = {row['weight_name']: row['weight_value'] for row in cursor}
     conn.close()
     return weights
 
-def get_pitcher_arsenal(player_id):
-    conn = get_db()
-    cursor = conn.cursor()
+def get_pitcher_arsenal(cursor, player_id):
     cursor.execute("""SELECT pitch_type, pitch_name, usage_pct, woba_against, xwoba_against, whiff_rate
         FROM pitch_arsenal WHERE player_id=? AND usage_pct>5 ORDER BY usage_pct DESC""", (player_id,))
-    arsenal = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return arsenal
-
-def get_hitter_vs_pitch(player_id):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT pitch_type, woba, xwoba, whiff_rate, run_value FROM hitter_vs_pitch WHERE player_id=?", (player_id,))
-    vs_pitch = {row['pitch_type']: dict(row) for row in cursor.fetchall()}
-    conn.close()
-    return vs_pitch
-
-def get_hitter_split(player_id, pitcher_hand):
-    """Get hitter's stats vs LHP or RHP"""
-    conn = get_db()
-    cursor = conn.cursor()
-    split_type = 'vs_LHP' if pitcher_hand == 'L' else 'vs_RHP'
-    cursor.execute("SELECT * FROM hitter_splits WHERE player_id=? AND split_type=?", (player_id, split_type))
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
-
-def get_hitter_discipline(player_id):
-    """Get hitter's plate discipline metrics"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM hitter_discipline WHERE player_id=?", (player_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    return cursor.fetchall()
 
-def get_pitcher_discipline(player_id):
-    """Get pitcher's plate discipline metrics"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM pitcher_discipline WHERE player_id=?", (player_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
+def get_player_rows(cursor, table, player_ids, columns='*'):
+    """Rows of a per-player table for a whole set of ids in one query: {player_id: [row, ...]}"""
+    ids = list(dict.fromkeys(player_ids))
+    rows = {pid: [] for pid in ids}
+    if ids:
+        cursor.execute(f"SELECT {columns} FROM {table} WHERE player_id IN ({','.join('?' * len(ids))})", ids)
+        for row in cursor:
+            rows[row['player_id']].append(row)
+    return rows
 
-def get_catcher_stats(player_id):
-    """Get catcher framing/blocking stats"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM catcher_stats WHERE player_id=?", (player_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
-
-def get_team_defense(team_id):
+def get_team_defense(cursor, team_id):
     """Get team's total defensive value (sum of OAA for starters)"""
-    conn = get_db()
-    cursor = conn.cursor()
     cursor.execute("""SELECT SUM(outs_above_avg) as total_oaa, SUM(fielding_runs_prevented) as total_frp
         FROM fielding_stats f JOIN players p ON f.player_id = p.player_id
         WHERE p.team_id = ?""", (team_id,))
     row = cursor.fetchone()
-    conn.close()
     if row and row['total_oaa']:
         return {'oaa': row['total_oaa'], 'frp': row['total_frp']}
     return None
@@ -836,8 +920,14 @@ def calculate_arsenal_matchup(pitcher_arsenal, hitter_vs_pitch, weights):
         return round(weighted_woba / total_usage, 3), breakdown
     return None, []
 
-def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, pitcher_arsenal=None, hitter_vs_pitch=None, pitcher_hand='R', catcher=None, team_defense=None):
-    """Calculate single batter vs pitcher matchup with full transparency."""
+def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, pitcher_arsenal=None, hitter_vs_pitch=None, pitcher_hand='R', catcher=None, team_defense=None,
+                               split_data=None, h_disc=None, p_disc=None, catcher_stats=None, verbose=True):
+    """Calculate single batter vs pitcher matchup with full transparency.
+
+    The per-player rows (split vs this hand, disciplines, catcher stats) are
+    fetched by the caller, a lineup at a time. With verbose=False the
+    per-step explanation list is left empty; the summary fields are the same.
+    """
     if weights is None:
         weights = get_model_weights()
     breakdown = {'hitter_name': hitter.get('name', 'Unknown'), 'steps': []}
@@ -845,18 +935,17 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
     # ===========================================
     # STEP 1: BASELINE wOBA (with L/R splits)
     # ===========================================
-    split_data = get_hitter_split(hitter.get('player_id', ''), pitcher_hand)
-    
     if split_data and split_data.get('woba'):
         # USE SPLIT DATA - this is the key integration
         baseline = split_data['woba']
         split_pa = split_data.get('pa', 0)
-        breakdown['steps'].append({
-            'name': f"Baseline wOBA (vs {pitcher_hand}HP)", 
-            'formula': f"Split wOBA from {split_pa} PA vs {pitcher_hand}HP",
-            'values': f"vs {pitcher_hand}HP: {baseline:.3f}", 
-            'result': round(baseline, 3)
-        })
+        if verbose:
+            breakdown['steps'].append({
+                'name': f"Baseline wOBA (vs {pitcher_hand}HP)", 
+                'formula': f"Split wOBA from {split_pa} PA vs {pitcher_hand}HP",
+                'values': f"vs {pitcher_hand}HP: {baseline:.3f}", 
+                'result': round(baseline, 3)
+            })
         breakdown['used_split'] = True
         breakdown['split_pa'] = split_pa
     else:
@@ -864,12 +953,13 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
         h_woba = hitter.get('woba') or LEAGUE_AVG['woba']
         h_xwoba = hitter.get('xwoba') or h_woba
         baseline = (h_woba + h_xwoba) / 2
-        breakdown['steps'].append({
-            'name': 'Baseline wOBA', 
-            'formula': '(wOBA + xwOBA) / 2',
-            'values': f"({format_stat(h_woba)} + {format_stat(h_xwoba)}) / 2", 
-            'result': round(baseline, 3)
-        })
+        if verbose:
+            breakdown['steps'].append({
+                'name': 'Baseline wOBA', 
+                'formula': '(wOBA + xwOBA) / 2',
+                'values': f"({format_stat(h_woba)} + {format_stat(h_xwoba)}) / 2", 
+                'result': round(baseline, 3)
+            })
         breakdown['used_split'] = False
     
     # ===========================================
@@ -882,12 +972,13 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
         arsenal_woba, arsenal_breakdown = calculate_arsenal_matchup(pitcher_arsenal, hitter_vs_pitch, weights)
         if arsenal_woba:
             arsenal_adj = (arsenal_woba - baseline) * arsenal_weight
-            breakdown['steps'].append({
-                'name': 'Pitch Arsenal Matchup',
-                'formula': f"(Arsenal wOBA - Baseline) × {arsenal_weight}",
-                'values': f"({arsenal_woba:.3f} - {baseline:.3f}) × {arsenal_weight}",
-                'result': round(arsenal_adj, 4)
-            })
+            if verbose:
+                breakdown['steps'].append({
+                    'name': 'Pitch Arsenal Matchup',
+                    'formula': f"(Arsenal wOBA - Baseline) × {arsenal_weight}",
+                    'values': f"({arsenal_woba:.3f} - {baseline:.3f}) × {arsenal_weight}",
+                    'result': round(arsenal_adj, 4)
+                })
             breakdown['arsenal_breakdown'] = arsenal_breakdown
     
     # ===========================================
@@ -896,20 +987,18 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
     p_xfip = pitcher.get('xfip') or pitcher.get('era') or LEAGUE_AVG['xfip']
     pitcher_factor = weights.get('pitcher_quality_factor', 0.012)
     pitcher_adj = (LEAGUE_AVG['xfip'] - p_xfip) * pitcher_factor
-    breakdown['steps'].append({
-        'name': 'Pitcher Quality', 
-        'formula': f"(League xFIP - Pitcher xFIP) × {pitcher_factor}",
-        'values': f"({LEAGUE_AVG['xfip']:.2f} - {p_xfip:.2f}) × {pitcher_factor}", 
-        'result': round(pitcher_adj, 4)
-    })
+    if verbose:
+        breakdown['steps'].append({
+            'name': 'Pitcher Quality', 
+            'formula': f"(League xFIP - Pitcher xFIP) × {pitcher_factor}",
+            'values': f"({LEAGUE_AVG['xfip']:.2f} - {p_xfip:.2f}) × {pitcher_factor}", 
+            'result': round(pitcher_adj, 4)
+        })
     
     # ===========================================
     # STEP 4: DISCIPLINE MATCHUP
     # ===========================================
     discipline_adj = 0
-    h_disc = get_hitter_discipline(hitter.get('player_id', ''))
-    p_disc = get_pitcher_discipline(pitcher.get('player_id', ''))
-    
     if h_disc and p_disc:
         # Chase rate interaction: high chase hitter vs high chase-inducing pitcher
         h_chase = h_disc.get('o_swing_pct') or 0.30
@@ -918,21 +1007,23 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
         # High chase hitter (>35%) vs pitcher who induces chase (>35%) = bad for hitter
         if h_chase > 0.35 and p_chase_rate > 0.35:
             discipline_adj = -0.008
-            breakdown['steps'].append({
-                'name': 'Discipline Matchup',
-                'formula': 'High chase hitter vs chase-inducing pitcher',
-                'values': f"H O-Swing: {h_chase:.1%}, P O-Swing: {p_chase_rate:.1%}",
-                'result': round(discipline_adj, 4)
-            })
+            if verbose:
+                breakdown['steps'].append({
+                    'name': 'Discipline Matchup',
+                    'formula': 'High chase hitter vs chase-inducing pitcher',
+                    'values': f"H O-Swing: {h_chase:.1%}, P O-Swing: {p_chase_rate:.1%}",
+                    'result': round(discipline_adj, 4)
+                })
         # Low chase hitter vs pitcher who can't induce chase = good for hitter
         elif h_chase < 0.28 and p_chase_rate < 0.28:
             discipline_adj = 0.005
-            breakdown['steps'].append({
-                'name': 'Discipline Matchup',
-                'formula': 'Patient hitter vs non-chase pitcher',
-                'values': f"H O-Swing: {h_chase:.1%}, P O-Swing: {p_chase_rate:.1%}",
-                'result': round(discipline_adj, 4)
-            })
+            if verbose:
+                breakdown['steps'].append({
+                    'name': 'Discipline Matchup',
+                    'formula': 'Patient hitter vs non-chase pitcher',
+                    'values': f"H O-Swing: {h_chase:.1%}, P O-Swing: {p_chase_rate:.1%}",
+                    'result': round(discipline_adj, 4)
+                })
     
     # ===========================================
     # STEP 5: K-RATE INTERACTION
@@ -948,41 +1039,43 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
     else:
         k_adj = 0
         k_reason = f"Neutral K (P K/9: {p_k9:.1f}, H K%: {h_k_rate:.1f}%)"
-    breakdown['steps'].append({
-        'name': 'K-Rate Interaction', 
-        'formula': k_reason, 
-        'values': '', 
-        'result': round(k_adj, 4)
-    })
+    if verbose:
+        breakdown['steps'].append({
+            'name': 'K-Rate Interaction', 
+            'formula': k_reason, 
+            'values': '', 
+            'result': round(k_adj, 4)
+        })
     
     # ===========================================
     # STEP 6: PARK FACTOR
     # ===========================================
     park_mult = weights.get('park_factor_multiplier', 0.015)
     park_adj = (park_factor - 1.0) * park_mult
-    breakdown['steps'].append({
-        'name': 'Park Factor', 
-        'formula': f"(Park - 1.0) × {park_mult}",
-        'values': f"({park_factor:.2f} - 1.0) × {park_mult}", 
-        'result': round(park_adj, 4)
-    })
+    if verbose:
+        breakdown['steps'].append({
+            'name': 'Park Factor', 
+            'formula': f"(Park - 1.0) × {park_mult}",
+            'values': f"({park_factor:.2f} - 1.0) × {park_mult}", 
+            'result': round(park_adj, 4)
+        })
     
     # ===========================================
     # STEP 7: CATCHER FRAMING
     # ===========================================
     catcher_adj = 0
     if catcher:
-        catcher_stats = get_catcher_stats(catcher.get('player_id', ''))
         if catcher_stats and catcher_stats.get('framing_runs'):
             framing = catcher_stats['framing_runs']
             # ~10 framing runs over season = ~0.003 wOBA impact per PA
             catcher_adj = -framing * 0.0003  # Negative because good framing helps pitcher
-            breakdown['steps'].append({
-                'name': 'Catcher Framing',
-                'formula': f"Framing runs ({framing:.1f}) × -0.0003",
-                'values': f"{catcher.get('name', 'Unknown')}: {framing:.1f} framing runs",
-                'result': round(catcher_adj, 4)
-            })
+            if verbose:
+                breakdown['steps'].append({
+                    'name': 'Catcher Framing',
+                    'formula': f"Framing runs ({framing:.1f}) × -0.0003",
+                    'values': f"{catcher.get('name', 'Unknown')}: {framing:.1f} framing runs",
+                    'result': round(catcher_adj, 4)
+                })
     
     # ===========================================
     # STEP 8: TEAM DEFENSE (applied at team level, small per-PA impact)
@@ -992,24 +1085,26 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
         oaa = team_defense['oaa']
         # Good defense (OAA +20) = ~0.002 wOBA saved per PA
         defense_adj = -oaa * 0.0001
-        breakdown['steps'].append({
-            'name': 'Team Defense',
-            'formula': f"Team OAA ({oaa:.0f}) × -0.0001",
-            'values': f"Total OAA: {oaa:.0f}",
-            'result': round(defense_adj, 4)
-        })
+        if verbose:
+            breakdown['steps'].append({
+                'name': 'Team Defense',
+                'formula': f"Team OAA ({oaa:.0f}) × -0.0001",
+                'values': f"Total OAA: {oaa:.0f}",
+                'result': round(defense_adj, 4)
+            })
     
     # ===========================================
     # STEP 9: FINAL PROJECTED wOBA
     # ===========================================
     total_adj = arsenal_adj + pitcher_adj + discipline_adj + k_adj + park_adj + catcher_adj + defense_adj
     proj_woba = max(0.250, min(0.420, baseline + total_adj))
-    breakdown['steps'].append({
-        'name': 'Projected wOBA', 
-        'formula': 'Baseline + All Adjustments',
-        'values': f"{baseline:.3f} + {total_adj:.4f}", 
-        'result': round(proj_woba, 3)
-    })
+    if verbose:
+        breakdown['steps'].append({
+            'name': 'Projected wOBA', 
+            'formula': 'Baseline + All Adjustments',
+            'values': f"{baseline:.3f} + {total_adj:.4f}", 
+            'result': round(proj_woba, 3)
+        })
     
     # ===========================================
     # STEP 10: CONVERT TO RUNS
@@ -1018,12 +1113,13 @@ def calculate_matchup_detailed(pitcher, hitter, park_factor=1.0, weights=None, p
     woba_mult = weights.get('woba_to_runs_multiplier', 4.6)
     raw_runs = (proj_woba - woba_baseline) * woba_mult
     runs_per_pa = max(0.05, min(0.18, raw_runs))  # Tighter bounds for realistic totals
-    breakdown['steps'].append({
-        'name': 'Runs per PA', 
-        'formula': f"(wOBA - {woba_baseline}) × {woba_mult}",
-        'values': f"({proj_woba:.3f} - {woba_baseline}) × {woba_mult} = {raw_runs:.4f} → {runs_per_pa:.4f}", 
-        'result': round(runs_per_pa, 4)
-    })
+    if verbose:
+        breakdown['steps'].append({
+            'name': 'Runs per PA', 
+            'formula': f"(wOBA - {woba_baseline}) × {woba_mult}",
+            'values': f"({proj_woba:.3f} - {woba_baseline}) × {woba_mult} = {raw_runs:.4f} → {runs_per_pa:.4f}", 
+            'result': round(runs_per_pa, 4)
+        })
     
     # Summary
     breakdown['baseline_woba'] = round(baseline, 3)
@@ -1042,24 +1138,49 @@ def estimate_pitcher_innings(pitcher):
         return min(7.0, max(4.0, ip / gs))
     return 5.0
 
-def project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_factor=1.0, home_catcher=None, away_catcher=None, home_team_id=None, away_team_id=None):
+def project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_factor=1.0, home_catcher=None, away_catcher=None, home_team_id=None, away_team_id=None, verbose=True):
     """Full game projection with all data integrated."""
     weights = get_model_weights()
     pa_weights = [0.137, 0.130, 0.123, 0.116, 0.109, 0.103, 0.097, 0.093, 0.092]
     home_p_ip = estimate_pitcher_innings(home_pitcher)
     away_p_ip = estimate_pitcher_innings(away_pitcher)
     f5_pa = LEAGUE_AVG['pa_per_inning'] * 5
+    # (pa_share, expected F5 PA) per lineup slot; lineups are cut to 9 below
+    pa_slots = [(w, round(f5_pa * w, 2)) for w in pa_weights]
     
-    home_arsenal = get_pitcher_arsenal(home_pitcher.get('player_id', ''))
-    away_arsenal = get_pitcher_arsenal(away_pitcher.get('player_id', ''))
+    home_arsenal = load_pitcher_arsenal(home_pitcher.get('player_id', ''), roster_version)
+    away_arsenal = load_pitcher_arsenal(away_pitcher.get('player_id', ''), roster_version)
     
     # Get pitcher handedness (default R if not specified)
     home_p_hand = home_pitcher.get('throws', 'R') or 'R'
     away_p_hand = away_pitcher.get('throws', 'R') or 'R'
     
     # Get team defense stats
-    home_defense = get_team_defense(home_team_id) if home_team_id else None
-    away_defense = get_team_defense(away_team_id) if away_team_id else None
+    home_defense = load_team_defense(home_team_id, roster_version) if home_team_id else None
+    away_defense = load_team_defense(away_team_id, roster_version) if away_team_id else None
+    
+    # Per-player rows for both lineups, one query per table
+    hitter_ids = [h.get('player_id', '') for h in away_lineup[:9] + home_lineup[:9] if h]
+    conn = get_db(dict_row)
+    cursor = conn.cursor()
+    vs_pitch = get_player_rows(cursor, 'hitter_vs_pitch', hitter_ids, 'player_id, pitch_type, woba, xwoba, whiff_rate, run_value')
+    splits = get_player_rows(cursor, 'hitter_splits', hitter_ids, 'player_id, split_type, pa, woba')
+    h_discs = get_player_rows(cursor, 'hitter_discipline', hitter_ids, 'player_id, o_swing_pct')
+    p_discs = get_player_rows(cursor, 'pitcher_discipline', [home_pitcher.get('player_id', ''), away_pitcher.get('player_id', '')],
+                              'player_id, o_swing_pct')
+    catchers = get_player_rows(cursor, 'catcher_stats', [c.get('player_id', '') for c in (home_catcher, away_catcher) if c],
+                               'player_id, framing_runs')
+    conn.close()
+    
+    def matchup_rows(hitter, pitcher, hand, catcher):
+        # (hitter_vs_pitch, split, hitter discipline, pitcher discipline, catcher stats)
+        pid = hitter.get('player_id', '')
+        split_type = 'vs_LHP' if hand == 'L' else 'vs_RHP'
+        return ({row['pitch_type']: row for row in vs_pitch[pid]},
+                next((row for row in splits[pid] if row['split_type'] == split_type), None),
+                next(iter(h_discs[pid]), None),
+                next(iter(p_discs[pitcher.get('player_id', '')]), None),
+                next(iter(catchers[catcher.get('player_id', '')]), None) if catcher else None)
     
     result = {
         'home_pitcher': {
@@ -1095,14 +1216,14 @@ def project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_fact
     away_f5_runs = 0
     for i, hitter in enumerate(away_lineup[:9]):
         if not hitter: continue
-        hvp = get_hitter_vs_pitch(hitter.get('player_id', ''))
+        hvp, split_data, h_disc, p_disc, catcher_stats = matchup_rows(hitter, home_pitcher, home_p_hand, home_catcher)
         matchup = calculate_matchup_detailed(
             home_pitcher, hitter, park_factor, weights, 
-            home_arsenal, hvp, home_p_hand, home_catcher, home_defense
+            home_arsenal, hvp, home_p_hand, home_catcher, home_defense,
+            split_data, h_disc, p_disc, catcher_stats, verbose
         )
         matchup['lineup_position'] = i + 1
-        matchup['pa_share'] = pa_weights[i] if i < len(pa_weights) else 0.09
-        matchup['expected_pa'] = round(f5_pa * matchup['pa_share'], 2)
+        matchup['pa_share'], matchup['expected_pa'] = pa_slots[i]
         matchup['expected_runs'] = round(matchup['runs_per_pa'] * matchup['expected_pa'], 3)
         matchup['has_arsenal_data'] = len(hvp) > 0
         if matchup.get('used_split'):
@@ -1114,14 +1235,14 @@ def project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_fact
     home_f5_runs = 0
     for i, hitter in enumerate(home_lineup[:9]):
         if not hitter: continue
-        hvp = get_hitter_vs_pitch(hitter.get('player_id', ''))
+        hvp, split_data, h_disc, p_disc, catcher_stats = matchup_rows(hitter, away_pitcher, away_p_hand, away_catcher)
         matchup = calculate_matchup_detailed(
             away_pitcher, hitter, park_factor, weights, 
-            away_arsenal, hvp, away_p_hand, away_catcher, away_defense
+            away_arsenal, hvp, away_p_hand, away_catcher, away_defense,
+            split_data, h_disc, p_disc, catcher_stats, verbose
         )
         matchup['lineup_position'] = i + 1
-        matchup['pa_share'] = pa_weights[i] if i < len(pa_weights) else 0.09
-        matchup['expected_pa'] = round(f5_pa * matchup['pa_share'], 2)
+        matchup['pa_share'], matchup['expected_pa'] = pa_slots[i]
         matchup['expected_runs'] = round(matchup['runs_per_pa'] * matchup['expected_pa'], 3)
         matchup['has_arsenal_data'] = len(hvp) > 0
         if matchup.get('used_split'):
@@ -1177,13 +1298,142 @@ def project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_fact
     
     return result
 
+# =============================================================================
+# CACHED QUERIES
+# =============================================================================
+
+# Team pages, rosters, defense totals and pitch arsenals only change on import
+# or a roster move, so their queries are memoized per roster version; writers
+# call invalidate_caches() to bump it and to drop the cached model weights.
+# Projections also depend on the weights, so a weights update bumps it too.
+_roster_versions = itertools.count()
+roster_version = next(_roster_versions)
+
+def invalidate_caches():
+    global roster_version
+    # Order matters: clear the unversioned weights cache before publishing the
+    # new version, or a concurrent projection could cache old weights under it
+    get_model_weights.cache_clear()
+    roster_version = next(_roster_versions)
+
+@functools.lru_cache(maxsize=1)
+def load_teams(version):
+    conn = get_db(dict_row)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM teams ORDER BY league, division, name")
+    teams = cursor.fetchall()
+    conn.close()
+    divisions = {}
+    for t in teams:
+        key = f"{t['league']} {t['division']}"
+        if key not in divisions:
+            divisions[key] = []
+        divisions[key].append(t)
+    return teams, divisions
+
+@functools.lru_cache(maxsize=64)
+def load_team(team_id, version):
+    conn = get_db(dict_row)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM teams WHERE team_id = ?", (team_id,))
+    team = cursor.fetchone()
+    if not team:
+        conn.close()
+        return None
+    # Only the columns team.html shows; p.*, ps.* also carried a second player_id
+    cursor.execute("""SELECT p.player_id, p.name, ps.era, ps.xera, ps.fip, ps.xfip, ps.k9, ps.bb9, ps.innings_pitched,
+        ps.games_started, ps.war
+        FROM players p LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id
+        WHERE p.team_id = ? AND p.position = 'P' ORDER BY ps.war DESC NULLS LAST""", (team_id,))
+    pitchers = cursor.fetchall()
+    cursor.execute("""SELECT p.player_id, p.name, hs.pa, hs.hr, hs.avg, hs.obp, hs.slg, hs.woba, hs.xwoba, hs.wrc_plus,
+        hs.k_rate, hs.bb_rate, hs.war
+        FROM players p LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id
+        WHERE p.team_id = ? AND p.position != 'P' ORDER BY hs.wrc_plus DESC NULLS LAST""", (team_id,))
+    hitters = cursor.fetchall()
+    conn.close()
+    return team, pitchers, hitters
+
+@functools.lru_cache(maxsize=64)
+def load_roster(team_id, version):
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute(ROSTER_SQL, (team_id,))
+    pitchers, hitters, park_factor = [], [], 1.0
+    for r in cursor:
+        park_factor = r['team_park_factor']
+        if r['position'] is None:
+            continue
+        player = {c: r[c] for c in ROSTER_PLAYER_COLUMNS}
+        if r['position'] == 'P':
+            player.update((c, r['ps_' + c]) for c in ROSTER_PITCHER_COLUMNS)
+            pitchers.append(player)
+        else:
+            player.update((c, r['hs_' + c]) for c in ROSTER_HITTER_COLUMNS)
+            hitters.append(player)
+    conn.close()
+    return {'pitchers': pitchers, 'hitters': hitters, 'park_factor': park_factor}
+
+@functools.lru_cache(maxsize=256)
+def load_pitcher_arsenal(player_id, version):
+    # Shared between projections; callers only read the rows
+    conn = get_db(dict_row)
+    arsenal = get_pitcher_arsenal(conn.cursor(), player_id)
+    conn.close()
+    return arsenal
+
+@functools.lru_cache(maxsize=32)
+def load_team_defense(team_id, version):
+    # Sums over the team's current fielders, so keyed on the roster version too
+    conn = get_db()
+    defense = get_team_defense(conn.cursor(), team_id)
+    conn.close()
+    return defense
+
+@functools.lru_cache(maxsize=256)
+def load_projection(home_pitcher_id, away_pitcher_id, home_lineup_ids, away_lineup_ids, park_factor, verbose, version):
+    # Same inputs, same data, same weights -> same projection; callers only read it
+    # Only the columns project_game reads
+    conn = get_db(dict_row)
+    cursor = conn.cursor()
+    cursor.execute("""SELECT p.player_id, p.name, p.throws, ps.era, ps.xfip, ps.k9,
+        ps.innings_pitched, ps.games_started, ps.avg_innings_per_start
+        FROM players p LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id WHERE p.player_id IN (?, ?)""",
+                   (home_pitcher_id, away_pitcher_id))
+    pitchers = {row['player_id']: row for row in cursor}
+    hitter_ids = list(dict.fromkeys(home_lineup_ids + away_lineup_ids))
+    cursor.execute(f"""SELECT p.player_id, p.name, hs.woba, hs.xwoba, hs.k_rate
+        FROM players p LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id
+        WHERE p.player_id IN ({','.join('?' * len(hitter_ids))})""", hitter_ids)
+    hitters = {row['player_id']: row for row in cursor}
+    conn.close()
+    home_pitcher = pitchers.get(home_pitcher_id, {})
+    away_pitcher = pitchers.get(away_pitcher_id, {})
+    # Requested order, dropping unknown ids
+    home_lineup = [hitters[pid] for pid in home_lineup_ids if pid in hitters]
+    away_lineup = [hitters[pid] for pid in away_lineup_ids if pid in hitters]
+    return project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_factor, verbose=verbose)
+
 # =============================================================================
 # INITIALIZE
 # =============================================================================
 
+def bootstrap():
+    """Create the schema, importing CSVs only if they changed since the last import."""
+    init_db()
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA user_version")
+    imported = cursor.fetchone()[0]
+    current = data_fingerprint(cursor)
+    conn.close()
+    if imported != current:
+        import_csvs()
+    else:
+        print("CSV data unchanged since last import - skipping")
+
 print("Initializing MLB Prediction Model v3.0...")
-init_db()
-import_csvs()
+bootstrap()
 
 # =============================================================================
 # ROUTES
@@ -1193,29 +1443,15 @@ import_csvs()
 def index():
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) as cnt FROM players WHERE position = 'P'")
-    pitcher_count = cursor.fetchone()['cnt']
-    cursor.execute("SELECT COUNT(*) as cnt FROM players WHERE position != 'P'")
-    hitter_count = cursor.fetchone()['cnt']
-    cursor.execute("SELECT COUNT(*) as cnt FROM pitch_arsenal")
-    arsenal_count = cursor.fetchone()['cnt']
-    cursor.execute("SELECT COUNT(*) as cnt FROM hitter_vs_pitch")
-    hitter_vs_pitch_count = cursor.fetchone()['cnt']
-    cursor.execute("SELECT COUNT(*) as cnt FROM predictions")
-    prediction_count = cursor.fetchone()['cnt']
-    cursor.execute("SELECT * FROM teams ORDER BY league, division, name")
-    teams = [dict(r) for r in cursor.fetchall()]
-    divisions = {}
-    for t in teams:
-        key = f"{t['league']} {t['division']}"
-        if key not in divisions:
-            divisions[key] = []
-        divisions[key].append(t)
+    cursor.execute("""SELECT COUNT(CASE WHEN position = 'P' THEN 1 END), COUNT(CASE WHEN position != 'P' THEN 1 END),
+        (SELECT COUNT(*) FROM pitch_arsenal), (SELECT COUNT(*) FROM hitter_vs_pitch), (SELECT COUNT(*) FROM predictions)
+        FROM players""")
+    pitcher_count, hitter_count, arsenal_count, hitter_vs_pitch_count, prediction_count = cursor.fetchone()
+    teams, divisions = load_teams(roster_version)
     cursor.execute("SELECT * FROM predictions ORDER BY created_at DESC LIMIT 5")
     recent_predictions = [dict(r) for r in cursor.fetchall()]
-    cursor.execute("SELECT weight_name, weight_value FROM model_weights")
-    weights = {row['weight_name']: row['weight_value'] for row in cursor.fetchall()}
     conn.close()
+    weights = get_model_weights()
     return render_template('index.html', pitcher_count=pitcher_count, hitter_count=hitter_count,
         arsenal_count=arsenal_count, hitter_vs_pitch_count=hitter_vs_pitch_count,
         prediction_count=prediction_count, teams=teams, divisions=divisions,
@@ -1223,94 +1459,72 @@ def index():
 
 @app.route('/teams')
 def teams_list():
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM teams ORDER BY league, division, name")
-    teams = [dict(r) for r in cursor.fetchall()]
-    conn.close()
-    divisions = {}
-    for t in teams:
-        key = f"{t['league']} {t['division']}"
-        if key not in divisions:
-            divisions[key] = []
-        divisions[key].append(t)
+    teams, divisions = load_teams(roster_version)
     return render_template('teams.html', teams=teams, divisions=divisions)
 
 @app.route('/team/<team_id>')
 def team_detail(team_id):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM teams WHERE team_id = ?", (team_id,))
-    team = cursor.fetchone()
-    if not team:
+    data = load_team(team_id, roster_version)
+    if data is None:
         return "Team not found", 404
-    team = dict(team)
-    cursor.execute("""SELECT p.*, ps.* FROM players p LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id
-        WHERE p.team_id = ? AND p.position = 'P' ORDER BY ps.war DESC NULLS LAST""", (team_id,))
-    pitchers = [dict(r) for r in cursor.fetchall()]
-    cursor.execute("""SELECT p.*, hs.* FROM players p LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id
-        WHERE p.team_id = ? AND p.position != 'P' ORDER BY hs.wrc_plus DESC NULLS LAST""", (team_id,))
-    hitters = [dict(r) for r in cursor.fetchall()]
-    conn.close()
+    team, pitchers, hitters = data
     return render_template('team.html', team=team, pitchers=pitchers, hitters=hitters)
 
 @app.route('/player/<player_id>')
 def player_detail(player_id):
-    conn = get_db()
+    conn = get_db(dict_row)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM players WHERE player_id = ?", (player_id,))
     player = cursor.fetchone()
     if not player:
         return "Player not found", 404
-    player = dict(player)
     if player['position'] == 'P':
         cursor.execute("SELECT * FROM pitcher_stats WHERE player_id = ?", (player_id,))
         stats = cursor.fetchone()
         if stats:
-            player.update(dict(stats))
+            player.update(stats)
         cursor.execute("SELECT * FROM pitch_arsenal WHERE player_id = ? ORDER BY usage_pct DESC", (player_id,))
-        player['arsenal'] = [dict(r) for r in cursor.fetchall()]
+        player['arsenal'] = cursor.fetchall()
         player_type = 'pitcher'
     else:
         cursor.execute("SELECT * FROM hitter_stats WHERE player_id = ?", (player_id,))
         stats = cursor.fetchone()
         if stats:
-            player.update(dict(stats))
+            player.update(stats)
         cursor.execute("SELECT * FROM hitter_vs_pitch WHERE player_id = ? ORDER BY pa DESC", (player_id,))
-        player['vs_pitch'] = [dict(r) for r in cursor.fetchall()]
+        player['vs_pitch'] = cursor.fetchall()
         player_type = 'hitter'
     cursor.execute("SELECT * FROM teams WHERE team_id = ?", (player.get('team_id'),))
-    team = cursor.fetchone()
-    player['team'] = dict(team) if team else None
+    player['team'] = cursor.fetchone()
     conn.close()
     return render_template('player.html', player=player, player_type=player_type)
 
 @app.route('/matchup')
 def matchup():
-    conn = get_db()
+    conn = get_db(dict_row)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM teams ORDER BY name")
-    teams = [dict(r) for r in cursor.fetchall()]
+    teams = cursor.fetchall()
     conn.close()
     return render_template('matchup.html', teams=teams)
 
 @app.route('/results')
 def results():
-    conn = get_db()
+    conn = get_db(dict_row)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM predictions ORDER BY created_at DESC LIMIT 100")
-    predictions = [dict(r) for r in cursor.fetchall()]
+    predictions = cursor.fetchall()
     cursor.execute("SELECT COUNT(*) as total, SUM(CASE WHEN actual_home IS NOT NULL THEN 1 ELSE 0 END) as with_results FROM predictions")
     stats = cursor.fetchone()
     conn.close()
-    return render_template('results.html', predictions=predictions, stats=dict(stats) if stats else {})
+    return render_template('results.html', predictions=predictions, stats=stats or {})
 
 @app.route('/roster-manager')
 def roster_manager():
-    conn = get_db()
+    conn = get_db(dict_row)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM teams ORDER BY name")
-    teams = [dict(r) for r in cursor.fetchall()]
+    teams = cursor.fetchall()
     conn.close()
     return render_template('roster_manager.html', teams=teams)
 
@@ -1318,51 +1532,41 @@ def roster_manager():
 # API ROUTES
 # =============================================================================
 
+ROSTER_PLAYER_COLUMNS = ('player_id', 'name', 'team_id', 'position', 'bats', 'throws', 'mlbam_id')
+ROSTER_PITCHER_COLUMNS = ('era', 'xfip', 'k9', 'bb9', 'war', 'xwoba_against', 'whiff_rate',
+                          'innings_pitched', 'games_started', 'avg_innings_per_start')
+ROSTER_HITTER_COLUMNS = ('woba', 'xwoba', 'wrc_plus', 'ops', 'war', 'k_rate', 'bb_rate',
+                         'barrel_rate', 'avg', 'hr', 'pa')
+
+# One pass for the whole roster: the one-row driving table keeps the team's
+# park factor in the result even when it has no players. Stat columns are
+# prefixed (ps_/hs_) because both stat tables have a 'war' column.
+ROSTER_SQL = f"""SELECT {', '.join('p.' + c for c in ROSTER_PLAYER_COLUMNS)},
+    {', '.join(f'ps.{c} AS ps_{c}' for c in ROSTER_PITCHER_COLUMNS)},
+    {', '.join(f'hs.{c} AS hs_{c}' for c in ROSTER_HITTER_COLUMNS)},
+    COALESCE(t.park_factor, 1.0) AS team_park_factor
+    FROM (SELECT ? AS team_id) q
+    LEFT JOIN teams t ON t.team_id = q.team_id
+    LEFT JOIN players p ON p.team_id = q.team_id
+    LEFT JOIN pitcher_stats ps ON p.position = 'P' AND ps.player_id = p.player_id
+    LEFT JOIN hitter_stats hs ON p.position != 'P' AND hs.player_id = p.player_id
+    ORDER BY p.position != 'P', ps.war DESC NULLS LAST, hs.wrc_plus DESC NULLS LAST"""
+
 @app.route('/api/team/<team_id>/roster')
 def api_roster(team_id):
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""SELECT p.*, ps.era, ps.xfip, ps.k9, ps.bb9, ps.war, ps.xwoba_against, 
-        ps.whiff_rate, ps.innings_pitched, ps.games_started, ps.avg_innings_per_start
-        FROM players p LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id
-        WHERE p.team_id = ? AND p.position = 'P' ORDER BY ps.war DESC NULLS LAST""", (team_id,))
-    pitchers = [dict(r) for r in cursor.fetchall()]
-    cursor.execute("""SELECT p.*, hs.woba, hs.xwoba, hs.wrc_plus, hs.ops, hs.war, hs.k_rate, 
-        hs.bb_rate, hs.barrel_rate, hs.avg, hs.hr, hs.pa
-        FROM players p LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id
-        WHERE p.team_id = ? AND p.position != 'P' ORDER BY hs.wrc_plus DESC NULLS LAST""", (team_id,))
-    hitters = [dict(r) for r in cursor.fetchall()]
-    cursor.execute("SELECT park_factor FROM teams WHERE team_id = ?", (team_id,))
-    team = cursor.fetchone()
-    conn.close()
-    return jsonify({'pitchers': pitchers, 'hitters': hitters, 'park_factor': team['park_factor'] if team else 1.0})
+    # Browsers revalidate on every fetch (roster moves must show at once);
+    # an unchanged roster comes back as a bodiless 304
+    response = jsonify(load_roster(team_id, roster_version))
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/api/project', methods=['POST'])
 def api_project():
     data = request.json
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT p.*, ps.* FROM players p LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id WHERE p.player_id = ?", (data.get('home_pitcher_id'),))
-    home_p = cursor.fetchone()
-    home_pitcher = dict(home_p) if home_p else {}
-    cursor.execute("SELECT p.*, ps.* FROM players p LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id WHERE p.player_id = ?", (data.get('away_pitcher_id'),))
-    away_p = cursor.fetchone()
-    away_pitcher = dict(away_p) if away_p else {}
-    home_lineup = []
-    for pid in data.get('home_lineup', []):
-        cursor.execute("SELECT p.*, hs.* FROM players p LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id WHERE p.player_id = ?", (pid,))
-        h = cursor.fetchone()
-        if h:
-            home_lineup.append(dict(h))
-    away_lineup = []
-    for pid in data.get('away_lineup', []):
-        cursor.execute("SELECT p.*, hs.* FROM players p LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id WHERE p.player_id = ?", (pid,))
-        h = cursor.fetchone()
-        if h:
-            away_lineup.append(dict(h))
-    conn.close()
-    park_factor = data.get('park_factor', 1.0)
-    result = project_game(home_pitcher, away_pitcher, home_lineup, away_lineup, park_factor)
+    result = load_projection(data.get('home_pitcher_id'), data.get('away_pitcher_id'),
+        tuple(data.get('home_lineup', [])), tuple(data.get('away_lineup', [])),
+        data.get('park_factor', 1.0), data.get('verbose', True), roster_version)
     return jsonify(result)
 
 @app.route('/api/save-prediction', methods=['POST'])
@@ -1370,10 +1574,10 @@ def api_save_prediction():
     data = request.json
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute("""INSERT INTO predictions (game_date, home_team, away_team, home_pitcher, away_pitcher, 
+    cursor.execute("""INSERT INTO predictions (game_date, game_date_i, home_team, away_team, home_pitcher, away_pitcher, 
         home_pitcher_id, away_pitcher_id, f5_home, f5_away, f5_total, full_home, full_away, full_total)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (data.get('game_date'), data.get('home_team'), data.get('away_team'), data.get('home_pitcher'),
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (data.get('game_date'), to_day(data.get('game_date')), data.get('home_team'), data.get('away_team'), data.get('home_pitcher'),
          data.get('away_pitcher'), data.get('home_pitcher_id'), data.get('away_pitcher_id'),
          data.get('f5_home'), data.get('f5_away'), data.get('f5_total'),
          data.get('full_home'), data.get('full_away'), data.get('full_total')))
@@ -1401,10 +1605,13 @@ def api_move_player(player_id):
     cursor.execute("UPDATE players SET team_id = ? WHERE player_id = ?", (data.get('team_id'), player_id))
     conn.commit()
     conn.close()
+    invalidate_caches()
     return jsonify({'success': True})
 
 @app.route('/api/search/players')
 def api_search_players():
+    # LIKE already folds ASCII case (and, like LOWER(), only ASCII), so the
+    # column is matched as-is and the name-ordered search can walk idx_players_name
     q = request.args.get('q', '').lower()
     player_type = request.args.get('type', 'all')
     conn = get_db()
@@ -1412,30 +1619,28 @@ def api_search_players():
     if player_type == 'pitcher':
         cursor.execute("""SELECT p.*, ps.era, ps.xfip, ps.war FROM players p
             LEFT JOIN pitcher_stats ps ON p.player_id = ps.player_id
-            WHERE p.position = 'P' AND LOWER(p.name) LIKE ? ORDER BY ps.war DESC NULLS LAST LIMIT 20""", (f'%{q}%',))
+            WHERE p.position = 'P' AND p.name LIKE ? ORDER BY ps.war DESC NULLS LAST LIMIT 20""", (f'%{q}%',))
     elif player_type == 'hitter':
         cursor.execute("""SELECT p.*, hs.woba, hs.wrc_plus, hs.war FROM players p
             LEFT JOIN hitter_stats hs ON p.player_id = hs.player_id
-            WHERE p.position != 'P' AND LOWER(p.name) LIKE ? ORDER BY hs.war DESC NULLS LAST LIMIT 20""", (f'%{q}%',))
+            WHERE p.position != 'P' AND p.name LIKE ? ORDER BY hs.war DESC NULLS LAST LIMIT 20""", (f'%{q}%',))
     else:
-        cursor.execute("SELECT * FROM players WHERE LOWER(name) LIKE ? ORDER BY name LIMIT 20", (f'%{q}%',))
+        cursor.execute("SELECT * FROM players WHERE name LIKE ? ORDER BY name LIMIT 20", (f'%{q}%',))
     players = [dict(r) for r in cursor.fetchall()]
     conn.close()
     return jsonify(players)
 
 @app.route('/api/weights', methods=['GET', 'POST'])
 def api_weights():
-    conn = get_db()
-    cursor = conn.cursor()
     if request.method == 'POST':
         data = request.json
-        for name, value in data.items():
-            cursor.execute("UPDATE model_weights SET weight_value = ?, updated_at = CURRENT_TIMESTAMP WHERE weight_name = ?", (value, name))
+        conn = get_db()
+        conn.executemany("UPDATE model_weights SET weight_value = ?, updated_at = CURRENT_TIMESTAMP WHERE weight_name = ?",
+                         [(value, name) for name, value in data.items()])
         conn.commit()
-    cursor.execute("SELECT weight_name, weight_value FROM model_weights")
-    weights = {row['weight_name']: row['weight_value'] for row in cursor.fetchall()}
-    conn.close()
-    return jsonify(weights)
+        conn.close()
+        invalidate_caches()
+    return jsonify(get_model_weights())
 
 @app.route('/admin/import-csvs')
 def admin_import():
@@ -1448,9 +1653,11 @@ def admin_import():
 @app.route('/admin/reset-db')
 def admin_reset():
     try:
-        if os.path.exists(DB_PATH):
-            os.remove(DB_PATH)
+        for path in (DB_PATH, DB_PATH + '-wal', DB_PATH + '-shm'):
+            if os.path.exists(path):
+                os.remove(path)
         init_db()
+        invalidate_caches()
         result = import_csvs()
         return jsonify({'success': True, 'counts': result})
     except Exception as e: